@@ -102,6 +102,7 @@ class IndexingContext:
         "dyn_dims",
         "frozen_subs",
         "unbacked_symbols",
+        "_simplify_cache",
     ]
 
     __tk_context_idname__ = "IndexingContext"
@@ -113,6 +114,9 @@ class IndexingContext:
         self.dyn_dims: list[IndexSymbol] = []
         self.frozen_subs: list[tuple[IndexSymbol, int]] = []
         self.unbacked_symbols: list[IndexSymbol] = []
+        # Memoized results of simplify_expr. Only valid for the current
+        # frozen_subs, so it is cleared whenever they change.
+        self._simplify_cache: dict[IndexExpr, IndexExpr] = {}
 
     def next_dyn_dim(self) -> IndexSymbol:
         s = index_symbol(f"D{len(self.dyn_dims)}")
@@ -176,6 +180,7 @@ class IndexingContext:
         # we do forward-only inference.
         frozen_subs = self.frozen_subs
         frozen_subs.extend(self.subs.items())
+        self._simplify_cache.clear()
 
         # Check any equation based dims.
         errors = []
@@ -223,7 +228,7 @@ class IndexingContext:
             expr = symbolic_shape[pos]
         except IndexError:
             raise IndexError(f"Attempt to access out of range {shaped_type}[{pos}]")
-        return expr.subs(self.frozen_subs).simplify()
+        return self.simplify_expr(expr)
 
     def eval_static_dim(
         self, instance: Any, shaped_type: ShapedType, pos: int
@@ -235,7 +240,17 @@ class IndexingContext:
             return None
 
     def simplify_expr(self, expr: IndexExpr) -> IndexExpr:
-        return expr.subs(self.frozen_subs).simplify()
+        # Integer literals (slice starts/steps, folded bounds) are already in
+        # simplest form and have nothing to substitute.
+        if expr.is_Integer:
+            return expr
+        # The same expressions (dims, slice bounds) get simplified many times
+        # during codegen and sympy substitution + simplification is slow.
+        simplified = self._simplify_cache.get(expr)
+        if simplified is None:
+            simplified = expr.subs(self.frozen_subs).simplify()
+            self._simplify_cache[expr] = simplified
+        return simplified
 
     def get_static_value(self, expr: IndexExpr) -> Optional[int]:
         expr = self.simplify_expr(expr)
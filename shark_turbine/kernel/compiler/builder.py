@@ -1,4 +1,4 @@
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 from .._support.indexing import (
     IndexExpr,
@@ -21,6 +21,7 @@ from .ir import (
     IrType,
     Location,
     Operation,
+    OpResult,
     SymbolTable,
     Value,
     VectorType,
@@ -86,6 +87,12 @@ class ModuleBuilder:
 
 
 class _ScalarBuilder:
+    def __init__(self):
+        self._typeclass_cache: dict[str, str] = {}
+        # Specialization methods resolved so far, keyed by attribute name.
+        # None records a name that was looked up and is not implemented.
+        self._handler_cache: dict[str, Optional[Callable]] = {}
+
     def is_floating_point_type(self, t: IrType) -> bool:
         # TODO: Use FloatType from upstream when available.
         return str(t) in FLOAT_BITWIDTHS
@@ -100,14 +107,34 @@ class _ScalarBuilder:
         # If this is a vector type, get the element type.
         if isinstance(t, VectorType):
             t = t.element_type
+        # Keyed by the type's string form rather than the type itself so that
+        # the cache does not keep MLIR contexts alive.
+        type_str = str(t)
+        typeclass = self._typeclass_cache.get(type_str)
+        if typeclass is None:
+            typeclass = self._classify_type(t)
+            self._typeclass_cache[type_str] = typeclass
+        if typeclass == "index" and index_same_as_integer:
+            return "integer"
+        return typeclass
+
+    def _classify_type(self, t: IrType) -> str:
         if self.is_floating_point_type(t):
             return "float"
         if self.is_integer_type(t):
             return "integer"
         if self.is_index_type(t):
-            return "integer" if index_same_as_integer else "index"
+            return "index"
         raise CodegenError(f"Unknown typeclass for type `{t}`")
 
+    def _get_handler(self, attr_name: str) -> Optional[Callable]:
+        try:
+            return self._handler_cache[attr_name]
+        except KeyError:
+            handler = getattr(self, attr_name, None)
+            self._handler_cache[attr_name] = handler
+            return handler
+
     def get_float_bitwidth(self, t: IrType) -> int:
         # If this is a vector type, get the element type.
         if isinstance(t, VectorType):
@@ -128,9 +155,8 @@ class _ScalarBuilder:
         value_typeclass = self.get_typeclass(value_type)
         to_typeclass = self.get_typeclass(dtype)
         attr_name = f"to_dtype_{value_typeclass}_to_{to_typeclass}"
-        try:
-            handler = getattr(self, attr_name)
-        except AttributeError:
+        handler = self._get_handler(attr_name)
+        if handler is None:
             raise CodegenError(
                 f"No implemented path to implicitly promote scalar `{value_type}` to `{to_type}` (tried '{attr_name}')"
             )
@@ -158,6 +184,19 @@ class _ScalarBuilder:
             return self.constant_attr(0.0, t)
         raise CodegenError(f"Cannot create a zero attribute for type `{t}`")
 
+    def get_constant_int(self, value: Value) -> Optional[int]:
+        """Returns the python value if `value` is a scalar integer/index
+        `arith.constant`, otherwise None."""
+        if not OpResult.isinstance(value):
+            return None
+        owner = OpResult(value).owner
+        if owner.name != "arith.constant":
+            return None
+        attr = owner.attributes["value"]
+        if not IntegerAttr.isinstance(attr):
+            return None
+        return IntegerAttr(attr).value
+
     def constant(self, py_value, element_type: IrType) -> IRProxyValue:
         attr = self.constant_attr(py_value, element_type)
         return IRProxyValue(arith_d.constant(element_type, attr))
@@ -181,9 +220,8 @@ class _ScalarBuilder:
 
         typeclass = self.get_typeclass(lhs_ir_type, True)
         attr_name = f"binary_{op}_{typeclass}"
-        try:
-            handler = getattr(self, attr_name)
-        except AttributeError:
+        handler = self._get_handler(attr_name)
+        if handler is None:
             raise CodegenError(
                 f"Cannot perform binary arithmetic operation '{op}' between {lhs_ir_type} and {rhs_ir_type} (tried '{attr_name}')"
             )
@@ -204,9 +242,8 @@ class _ScalarBuilder:
 
         typeclass = self.get_typeclass(lhs_element_type, True)
         attr_name = f"binary_{op}_{typeclass}"
-        try:
-            handler = getattr(self, attr_name)
-        except AttributeError:
+        handler = self._get_handler(attr_name)
+        if handler is None:
             raise CodegenError(
                 f"Cannot perform binary arithmetic operation '{op}' between {lhs_ir.type} and {rhs_ir.type} (tried '{attr_name}')"
             )
@@ -216,9 +253,8 @@ class _ScalarBuilder:
         val_ir_type = val.ir_value.type
         typeclass = self.get_typeclass(val_ir_type, True)
         attr_name = f"unary_{op}_{typeclass}"
-        try:
-            handler = getattr(self, attr_name)
-        except AttributeError:
+        handler = self._get_handler(attr_name)
+        if handler is None:
             raise CodegenError(
                 f"Cannot perform unary arithmetic operation '{op}' on {val_ir_type} (tried '{attr_name}')"
             )
@@ -229,9 +265,8 @@ class _ScalarBuilder:
         val_element_type = VectorType(val_ir.type).element_type
         typeclass = self.get_typeclass(val_element_type, True)
         attr_name = f"unary_{op}_{typeclass}"
-        try:
-            handler = getattr(self, attr_name)
-        except AttributeError:
+        handler = self._get_handler(attr_name)
+        if handler is None:
             raise CodegenError(
                 f"Cannot perform unary arithmetic operation '{op}' on {val_ir.type} (tried '{attr_name}')"
             )
@@ -269,9 +304,21 @@ class _ScalarBuilder:
 
     # Binary integer/integer arithmetic.
     def binary_add_integer(self, lhs: IRProxyValue, rhs: IRProxyValue) -> IRProxyValue:
+        # Fold `0 + x` and `x + 0` without emitting an op.
+        if self.get_constant_int(lhs.ir_value) == 0:
+            return rhs
+        if self.get_constant_int(rhs.ir_value) == 0:
+            return lhs
         return IRProxyValue(arith_d.addi(lhs.ir_value, rhs.ir_value))
 
     def binary_mul_integer(self, lhs: IRProxyValue, rhs: IRProxyValue) -> IRProxyValue:
+        # Fold multiplication by the constants 0 and 1 without emitting an op.
+        lhs_const = self.get_constant_int(lhs.ir_value)
+        rhs_const = self.get_constant_int(rhs.ir_value)
+        if lhs_const == 0 or rhs_const == 1:
+            return lhs
+        if rhs_const == 0 or lhs_const == 1:
+            return rhs
         return IRProxyValue(arith_d.muli(lhs.ir_value, rhs.ir_value))
 
     def binary_sub_integer(self, lhs: IRProxyValue, rhs: IRProxyValue) -> IRProxyValue:
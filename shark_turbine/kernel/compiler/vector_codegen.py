@@ -8,6 +8,7 @@ level operations executed as threads over a grid.
 from typing import Any, Callable, Type, Optional, Sequence, Union, List
 import types
 
+import contextlib
 from dataclasses import dataclass
 import inspect
 import operator as py_operator
@@ -106,18 +107,42 @@ class ThreadEmitter:
     OP_HANDLERS: dict[Any, Callable[["ThreadEmitter", fx.Node], None]] = {}
 
     def __init__(self, root_sig: BoundKernelSignature, trace: CapturedTrace):
+        # Nodes overwhelmingly produce a single value, so keep those apart
+        # from multi-result nodes to avoid wrapping each one in a list.
+        self._node_value: dict[fx.Node, IRProxyValue] = {}
         self._node_values: dict[fx.Node, List[IRProxyValue]] = {}
         self._grid_axis_values: dict[int, IRProxyValue] = {}
+        self._kernel_buffers: dict[
+            fx.Node, tuple[Value, MemRefType, Type[KernelBuffer]]
+        ] = {}
+        # Scalar constants emitted so far, keyed by (type, value). There is one
+        # scope per region being emitted: constants from enclosing regions
+        # dominate nested ones and can be reused, but not the other way around.
+        self._constant_scopes: list[dict[tuple[str, str], Value]] = [{}]
         self._root_sig = root_sig
         self.trace = trace
         self.ip = InsertionPoint(root_sig.entry_block)
+        # The indexing context is fixed for the lifetime of the emitter, so
+        # resolve it once instead of on every index/literal cast.
+        self.idxc = IndexingContext.current()
+        # Created lazily since there may be no active MLIR context yet.
+        self._index_type: Optional[IndexType] = None
+
+    def lookup_node_value(self, node: fx.Node) -> IRProxyValue:
+        """Looks up the value of a node that produces exactly one value."""
+        assert NDEBUG or isinstance(node, fx.Node)
+        value = self._node_value.get(node)
+        if value is None:
+            if node in self._node_values:
+                raise CodegenError(f"Expected exactly one value for node {node}")
+            raise KeyError(node)
+        return value
 
-    def lookup_node_values(self, node: fx.Node) -> List[Value]:
+    def lookup_node_values(self, node: fx.Node) -> List[IRProxyValue]:
         assert NDEBUG or isinstance(node, fx.Node)
         values = self._node_values.get(node)
         if values is None:
-            values = [self._root_sig.resolve_by_reference(("node", node))]
-            self._node_values[node] = values
+            values = [self.lookup_node_value(node)]
         return values
 
     def lookup_grid_axis_value(self, grid_axis: int) -> IRProxyValue:
@@ -128,22 +153,51 @@ class ThreadEmitter:
                 ir_value = self._root_sig.resolve_by_reference(("grid", grid_axis))
             except KeyError:
                 raise CodegenError(f"Grid axis {grid_axis} out of bounds")
-            sym_index = SymIndex(IndexingContext.current().new_unbacked_symbol())
+            sym_index = SymIndex(self.idxc.new_unbacked_symbol())
             value = IRProxyValue(ir_value, sym_index)
             self._grid_axis_values[grid_axis] = value
         return value
 
+    def lookup_kernel_buffer(
+        self, node: fx.Node
+    ) -> tuple[Value, MemRefType, Type[KernelBuffer]]:
+        """Looks up the memref value of a KernelBuffer node and its types."""
+        # The same buffer is typically accessed by many loads/stores, so only
+        # validate and wrap its type once.
+        kb = self._kernel_buffers.get(node)
+        if kb is None:
+            try:
+                value = self.lookup_node_value(node)
+            except KeyError:
+                raise CodegenError(f"Producer node `{node}` has no IR Value")
+            ir_type = value.type
+            py_type = node.type
+
+            if not MemRefType.isinstance(ir_type):
+                raise CodegenError(
+                    f"Expected a KernelBuffer (aka. `memref`) but got `{ir_type}`"
+                )
+
+            if not issubclass(py_type, KernelBuffer):
+                raise CodegenError(
+                    f"Expected an lvalue of type KernelBuffer but got '{py_type}' for node {node}"
+                )
+
+            kb = value, MemRefType(ir_type), py_type
+            self._kernel_buffers[node] = kb
+        return kb
+
     def bind_node_proxy(
         self, node: fx.Node, proxy: IRProxyValue, *, attrs: Optional[NodeAttrs] = None
     ):
         """Binds a node's result to a Python/IR proxy object."""
         assert NDEBUG or (isinstance(node, fx.Node) and isinstance(proxy, IRProxyValue))
         assert (
-            node not in self._node_values
+            node not in self._node_value and node not in self._node_values
         ), f"Cannot rebind node {node}: already bound"
         if attrs is not None:
             attrs.store(node)
-        self._node_values[node] = [proxy]
+        self._node_value[node] = proxy
 
     def bind_node_proxies(
         self,
@@ -158,16 +212,64 @@ class ThreadEmitter:
             and isinstance(node, fx.Node)
         )
         assert (
-            node not in self._node_values
+            node not in self._node_value and node not in self._node_values
         ), f"Cannot rebind node {node}: already bound"
         if attrs is not None:
             attrs.store(node)
         self._node_values[node] = proxies
 
+    def get_constant(self, py_value: int | float, ir_type: IrType) -> Value:
+        """Returns a scalar constant, reusing a dominating one if already emitted."""
+        # repr keeps e.g. 0 / 0.0 / -0.0 apart.
+        key = (str(ir_type), repr(py_value))
+        for scope in reversed(self._constant_scopes):
+            value = scope.get(key)
+            if value is not None:
+                return value
+        value = ScalarBuilder.constant(py_value, ir_type).ir_value
+        self._constant_scopes[-1][key] = value
+        return value
+
+    @property
+    def index_type(self) -> IndexType:
+        if self._index_type is None:
+            self._index_type = IndexType.get()
+        return self._index_type
+
+    def get_index_constant(self, py_value: int) -> Value:
+        return self.get_constant(py_value, self.index_type)
+
+    def get_zero(self, ir_type: IrType) -> Value:
+        zero = 0.0 if ScalarBuilder.is_floating_point_type(ir_type) else 0
+        return self.get_constant(zero, ir_type)
+
+    @contextlib.contextmanager
+    def constant_scope(self):
+        """Opens a new constant scope for emitting into a nested region."""
+        self._constant_scopes.append({})
+        try:
+            yield
+        finally:
+            self._constant_scopes.pop()
+
     def emit(self):
         with self.ip, Location.unknown():
+            self.bind_signature_values()
             self.emit_graph(self.trace.get_root_graph())
 
+    def bind_signature_values(self):
+        """Binds all nodes backed by the kernel signature (i.e. placeholders).
+
+        Resolving may create IR (e.g. binding subspans), so this is done
+        once up front in the entry block rather than lazily on first use,
+        which could land inside a nested region and not dominate later uses.
+        Unused placeholders are skipped since they never need a value.
+        """
+        for binding in self._root_sig.sig.bindings:
+            ref_type, ref_value = binding.reference
+            if ref_type == "node" and ref_value.users:
+                self._node_value[ref_value] = self._root_sig.resolve(binding)
+
     def emit_function_call_node(self, node: fx.Node):
         target_op = node.target
         try:
@@ -192,7 +294,11 @@ class ThreadEmitter:
             implicit_capture
         ), f"Expected {len(freevars)} implicit capture args, got {len(implicit_capture)}"
         for freevar, arg in zip(freevars, implicit_capture):
-            self._node_values[freevar.node] = self.lookup_node_values(arg)
+            values = self._node_values.get(arg)
+            if values is None:
+                self._node_value[freevar.node] = self.lookup_node_value(arg)
+            else:
+                self._node_values[freevar.node] = values
 
         # Emit subgraph
         return self.emit_graph(subgraph)
@@ -248,6 +354,9 @@ def binary_broadcast(
     assert NDEBUG or (isinstance(lhs, IRProxyValue) and isinstance(rhs, IRProxyValue))
     lhs_type = lhs.ir_value.type
     rhs_type = rhs.ir_value.type
+    if lhs_type == rhs_type:
+        # Common case: identical scalars or vectors, nothing to promote.
+        return VectorType.isinstance(lhs_type), lhs, rhs
     lhs_is_vector = VectorType.isinstance(lhs_type)
     rhs_is_vector = VectorType.isinstance(rhs_type)
     if not lhs_is_vector and not rhs_is_vector:
@@ -384,8 +493,7 @@ def _(emitter: ThreadEmitter, node: fx.Node):
     vector_shape = extract_static_slice_shape(emitter, ref_shape, slice_spec)
     element_type = kb_ir_type.element_type
     vector_type = VectorType.get(vector_shape, element_type)
-    pad_attr = ScalarBuilder.zero_attr(element_type)
-    pad_value = arith_d.constant(element_type, pad_attr)
+    pad_value = emitter.get_zero(element_type)
     result = vector_d.transfer_read(
         vector_type,
         kb_src,
@@ -449,8 +557,7 @@ def _(emitter: ThreadEmitter, node: fx.Node):
     start_indices = extract_slice_starts(emitter, ref_shape, slice_spec)
     element_type = kb_ir_type.element_type
     vector_type = VectorType.get(vector_shape, element_type)
-    pad_attr = ScalarBuilder.zero_attr(element_type)
-    pad_value = arith_d.constant(element_type, pad_attr)
+    pad_value = emitter.get_zero(element_type)
     result = vector_d.transfer_read(
         vector_type,
         kb_src,
@@ -596,7 +703,7 @@ def emit_reduction(
     if raw_acc:
         acc = cast_vector(emitter, raw_acc)
     else:
-        acc = arith_d.constant(element_type, ScalarBuilder.zero_attr(element_type))
+        acc = emitter.get_zero(element_type)
 
     combiner = combiner_callback(element_type, attrs)
 
@@ -640,6 +747,34 @@ def _(element_type: IrType, attrs: NodeAttrs) -> vector_d.CombiningKind:
 ###############################################################################
 
 
+def _flatten_values(values) -> list:
+    """Flattens nested lists/tuples of values (e.g. loop args or results).
+
+    These are nearly always plain sequences of nodes, so only hand off to the
+    generic pytree machinery for other containers.
+    """
+    if not isinstance(values, (list, tuple)):
+        return pytree.tree_flatten(values)[0]
+    flat = []
+    for value in values:
+        if isinstance(value, (list, tuple, dict)):
+            flat.extend(_flatten_values(value))
+        else:
+            flat.append(value)
+    return flat
+
+
+def _get_static_trip_count(emitter: ThreadEmitter, start, end, step) -> Optional[int]:
+    """Returns the trip count of a loop with static bounds, or None if any of
+    the bounds is only known at runtime."""
+    if any(isinstance(v, fx.Node) for v in (start, end, step)):
+        return None
+    start, end, step = cast_py_literal(emitter, (start, end, step))
+    if not all(isinstance(v, int) for v in (start, end, step)) or step <= 0:
+        return None
+    return max(0, -(-(end - start) // step))
+
+
 @handle_op(tkl.for_loop)
 def _(emitter: ThreadEmitter, node: fx.Node):
     try:
@@ -654,52 +789,50 @@ def _(emitter: ThreadEmitter, node: fx.Node):
         if len(emitter.lookup_node_values(arg)) != 1:
             raise CodegenError(f"NYI: For loop init args must be flattened")
 
+    # A loop that runs exactly once is emitted inline, without an scf.for.
+    inline = _get_static_trip_count(emitter, start, end, step) == 1
+
     # Get IR values mapping to the node args.
-    start = cast_py_value(emitter, start)
-    end = cast_py_value(emitter, end)
-    step = cast_py_value(emitter, step)
+    start = cast_ir_value(emitter, start)
+    if not inline:
+        end = cast_ir_value(emitter, end)
+        step = cast_ir_value(emitter, step)
 
     # Flatten init_args and get IR values for each of them.
-    flat_init_args, init_args_spec = pytree.tree_flatten((init_args))
-    flat_init_args = [cast_py_value(emitter, arg) for arg in flat_init_args]
+    flat_init_args = [cast_ir_value(emitter, arg) for arg in _flatten_values(init_args)]
 
     # Get the subgraph for body of the loop.
     assert isinstance(subgraph, str)
     subgraph = emitter.trace.get_subgraph(subgraph)
+    # TODO: Flatten subgraph args here.
+    subgraph_args = [
+        node
+        for node in subgraph.nodes
+        if node.op == "placeholder" and "lifted" not in node.meta
+    ]
 
-    # Create scf.for operation.
-    forOp = scf_d.ForOp(
-        start.ir_value,
-        end.ir_value,
-        step.ir_value,
-        [a.ir_value for a in flat_init_args],
-    )
-    # Enter body of for loop.
-    with InsertionPoint(forOp.body):
-        # TODO: Flatten subgraph args here.
-        subgraph_args = [
-            node
-            for node in subgraph.nodes
-            if node.op == "placeholder" and "lifted" not in node.meta
-        ]
+    def emit_body(induction_variable: Value, iter_args: Sequence[Value]):
         # Add mapping for induction variable argument.
-        emitter.bind_node_proxy(
-            subgraph_args[0], IRProxyValue(forOp.induction_variable)
-        )
+        emitter.bind_node_proxy(subgraph_args[0], IRProxyValue(induction_variable))
         # Add mapping for iter_args.
-        for i, v in enumerate(forOp.inner_iter_args):
+        for i, v in enumerate(iter_args):
             emitter.bind_node_proxy(subgraph_args[i + 1], IRProxyValue(v))
 
         ret = emitter.emit_subgraph(subgraph, implicit_capture)
-        # Use ret in terminatory of body
         # TODO: Flatten return values here.
-        flat_ret_values, ret_spec = pytree.tree_flatten((ret))
-        flat_ret_values = [
-            cast_py_value(emitter, value).ir_value for value in flat_ret_values
-        ]
-        scf_d.YieldOp(flat_ret_values)
+        return [cast_ir_value(emitter, value) for value in _flatten_values(ret)]
+
+    if inline:
+        results = emit_body(start, flat_init_args)
+    else:
+        # Create scf.for operation.
+        forOp = scf_d.ForOp(start, end, step, flat_init_args)
+        # Enter body of for loop.
+        with InsertionPoint(forOp.body), emitter.constant_scope():
+            # Use the body results in the terminator.
+            scf_d.YieldOp(emit_body(forOp.induction_variable, forOp.inner_iter_args))
+        results = forOp.results_
 
-    results = forOp.results_
     emitter.bind_node_proxies(node, [IRProxyValue(v) for v in results])
 
 
@@ -752,7 +885,7 @@ def cast_py_literal(emitter: ThreadEmitter, value) -> Any:
     An exception will be raised if it cannot be computed statically.
     """
     if isinstance(value, IndexExpr):
-        simplified = IndexingContext.current().simplify_expr(value)
+        simplified = emitter.idxc.simplify_expr(value)
         try:
             return int(simplified)
         except TypeError as e:
@@ -782,13 +915,22 @@ def cast_py_value(emitter: ThreadEmitter, value) -> IRProxyValue:
     """
     if isinstance(value, fx.Node):
         try:
-            node_values = emitter.lookup_node_values(value)
-            assert len(node_values) == 1, f"Expected exactly one value for node {value}"
-            return node_values[0]
+            return emitter.lookup_node_value(value)
         except KeyError:
             raise CodegenError(f"Producer node `{value}` has no IR Value")
+    return IRProxyValue(cast_ir_value(emitter, value))
+
+
+def cast_ir_value(emitter: ThreadEmitter, value) -> Value:
+    """Same as `cast_py_value` but returns the bare IR Value.
+
+    Use this when the result is only passed on to an op builder, which avoids
+    wrapping constants in a proxy just to unwrap them again.
+    """
+    if isinstance(value, fx.Node):
+        return cast_py_value(emitter, value).ir_value
     elif isinstance(value, IndexExpr):
-        simplified = IndexingContext.current().simplify_expr(value)
+        simplified = emitter.idxc.simplify_expr(value)
         try:
             value = int(simplified)
         except TypeError as e:
@@ -796,17 +938,13 @@ def cast_py_value(emitter: ThreadEmitter, value) -> IRProxyValue:
                 f"Dynamically resolved symbolic values not yet implemented. Got: "
                 f"{simplified}"
             ) from e
-    return ScalarBuilder.constant(value, IndexType.get())
+    return emitter.get_index_constant(value)
 
 
 def cast_py_lvalue(emitter: ThreadEmitter, py_value: fx.Node) -> tuple[Value, fx.Node]:
     if isinstance(py_value, fx.Node):
         try:
-            node_values = emitter.lookup_node_values(py_value)
-            assert (
-                len(node_values) == 1
-            ), f"Expected exactly one value for node {py_value}"
-            return node_values[0], py_value
+            return emitter.lookup_node_value(py_value), py_value
         except KeyError:
             raise CodegenError(f"Producer node `{py_value}` has no IR Value")
     else:
@@ -819,21 +957,11 @@ def cast_kernel_buffer(
     emitter: ThreadEmitter, kb
 ) -> tuple[Value, MemRefType, Type[KernelBuffer]]:
     """Casts a Python value of type KernelBuffer, which lowers to a MemRefType'd value."""
-    value, node = cast_py_lvalue(emitter, kb)
-    ir_type = value.type
-    py_type = node.type
-
-    if not MemRefType.isinstance(ir_type):
+    if not isinstance(kb, fx.Node):
         raise CodegenError(
-            f"Expected a KernelBuffer (aka. `memref`) but got `{ir_type}`"
+            f"Required a traced node in the graph. Got: {kb} (type {type(kb)})"
         )
-
-    if not issubclass(py_type, KernelBuffer):
-        raise CodegenError(
-            f"Expected an lvalue of type KernelBuffer but got '{py_type}' for node {node}"
-        )
-
-    return value, MemRefType(ir_type), py_type
+    return emitter.lookup_kernel_buffer(kb)
 
 
 def cast_vector(
@@ -917,6 +1045,10 @@ def cast_slice_spec(
         raise IndexError(
             f"Cannot index into a rank expanding referrent with multiple `...` values"
         )
+    if len(py_slice_spec) > rank:
+        raise CodegenError(
+            f"Too many indices for referrent of rank {rank}: {py_slice_spec}"
+        )
 
     return [
         cast_slice_atom(emitter, ref_shape[i], py_slice_spec[i]) for i in range(rank)
@@ -932,7 +1064,7 @@ def cast_slice_atom(
         return py_slice_atom
     if isinstance(py_slice_atom, slice):
         # Re-compose.
-        idxc = IndexingContext.current()
+        idxc = emitter.idxc
         start = py_slice_atom.start
         stop = py_slice_atom.stop
         step = py_slice_atom.step
@@ -973,17 +1105,13 @@ def cast_index_value(
     if isinstance(py_index, int):
         return index_expr(py_index)
     if isinstance(py_index, IndexExpr):
-        return IndexingContext.current().simplify_expr(py_index)
+        return emitter.idxc.simplify_expr(py_index)
 
     # fx.Node -> IRProxyValue.
     if isinstance(py_index, fx.Node):
         # Cast index value.
         try:
-            node_values = emitter.lookup_node_values(py_index)
-            assert (
-                len(node_values) == 1
-            ), f"Expected exactly one value for node {py_index}"
-            py_index = node_values[0]
+            py_index = emitter.lookup_node_value(py_index)
         except KeyError:
             raise CodegenError(f"Producer node `{py_index}` has no IR Value")
 
@@ -1007,7 +1135,7 @@ def cast_dynamic_index_value(emitter: ThreadEmitter, py_index) -> IRProxyValue:
     except TypeError:
         # Need to materialize the expression.
         raise CodegenError(f"NYI: Materialized index expression {py_index}")
-    return ScalarBuilder.constant(int_value, IndexType.get())
+    return IRProxyValue(emitter.get_index_constant(int_value))
 
 
 def extract_slice_starts(
@@ -1015,16 +1143,19 @@ def extract_slice_starts(
     ref_shape: tuple[IndexExpr, ...],
     slice_spec: list[SliceAtom],
 ) -> list[Value]:
-    def _extract(i):
-        atom = slice_spec[i]
+    if len(slice_spec) > len(ref_shape):
+        raise CodegenError(
+            f"Slice {slice_spec} has more indices than the rank of shape {ref_shape}"
+        )
+    starts = []
+    for atom in slice_spec:
         if atom is None:
-            return ScalarBuilder.constant(0, IndexType.get())
-        elif isinstance(atom, slice):
-            return cast_dynamic_index_value(emitter, atom.start).ir_value
+            starts.append(emitter.get_index_constant(0))
         else:
-            return cast_dynamic_index_value(emitter, atom).ir_value
-
-    return [_extract(i) for i in range(len(ref_shape))]
+            if isinstance(atom, slice):
+                atom = atom.start
+            starts.append(cast_dynamic_index_value(emitter, atom).ir_value)
+    return starts
 
 
 def extract_static_slice_shape(
@@ -1034,7 +1165,7 @@ def extract_static_slice_shape(
 ) -> list[int]:
     rank = len(ref_shape)
     shape = [0] * rank
-    idxc = IndexingContext.current()
+    idxc = emitter.idxc
     for i in range(rank):
         atom = slice_spec[i]
         if atom is None:
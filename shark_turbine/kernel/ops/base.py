@@ -32,12 +32,13 @@ class OpDispatcher:
 
 def define_op(f: T) -> T:
     idname = f.__name__
+    handler_name = f"handle_{idname}"
 
     @functools.wraps(f)
     def wrapped(*args, **kwargs):
         dispatcher = OpDispatcher.current()
         try:
-            handler = getattr(dispatcher, f"handle_{idname}")
+            handler = getattr(dispatcher, handler_name)
         except AttributeError:
             raise AttributeError(
                 f"The current OpDispatcher ({dispatcher}) does not register a handler for {idname}"
@@ -69,11 +69,12 @@ def write(
 def define_op(op_name: str) -> Callable[[T], T]:
     def decorator(cls: T) -> T:
         cls.tkw_op_name = op_name
+        handler_name = f"handle_{op_name}"
 
         def new_function(*args: Any, **kwargs: dict[str, Any]):
             dispatcher = OpDispatcher.current()
             try:
-                handler = getattr(dispatcher, f"handle_{op_name}")
+                handler = getattr(dispatcher, handler_name)
             except AttributeError:
                 raise AttributeError(
                     f"The current OpDispatcher ({dispatcher}) does not register a handler for {op_name}"
@@ -93,15 +94,18 @@ def define_op(op_name: str) -> Callable[[T], T]:
 
 def get_custom(node: fx.Node) -> "CustomOp":
     """Get the corresponding CustomOp for a given fx.Node."""
+    # If the node was created as a CustomOp it has a corresponding field.
+    # This is by far the common case, so check it before anything else.
+    tkw_op = getattr(node, "tkw_op", None)
+    if tkw_op is not None:
+        return tkw_op.from_fx_node(node)
+
     if isinstance(node, CustomOp):
         print("Careful! You passed a custom op where an fx.Node was required.")
         return node
     if not isinstance(node, fx.Node):
         raise ValueError("Expected an fx.Node")
 
-    # If the node was created as a CustomOp it has a corresponding field
-    if hasattr(node, "tkw_op"):
-        return node.tkw_op.from_fx_node(node)
     if node.op == "placeholder":
         return Placeholder.from_fx_node(node)
     if node.op == "output":
@@ -128,6 +132,24 @@ class CustomOp(ABC):
         instance.graph = node.graph
         return instance
 
+    @classmethod
+    def _field_names(cls) -> tuple[str, ...]:
+        """Returns the names of the fields defined by the concrete op, i.e.
+        excluding the ones defined by the abstract base class."""
+        # Computed once per class on first use since `fields` is not cheap.
+        # Look in the class dict so subclasses do not pick up a parent's names.
+        field_names = cls.__dict__.get("_tkw_field_names")
+        if field_names is None:
+            inherited_field_count = len(CustomOp.__dataclass_fields__)
+            field_names = tuple(
+                field.name for field in fields(cls)[inherited_field_count:]
+            )
+            cls._tkw_field_names = field_names
+            cls._tkw_field_name_to_idx = {
+                name: idx for idx, name in enumerate(field_names)
+            }
+        return field_names
+
     def __post_init__(self):
         # Subclasses do not inherit hash and eq from the superclass
         self.__class__.__hash__ = CustomOp.__hash__
@@ -145,13 +167,13 @@ class CustomOp(ABC):
         return self.custom_string({})
 
     def custom_string(self, value_map: dict[str, str]) -> str:
-        # print all variables of the node apart from graph and fx_node
-        vars_list = [f"{key}={value}" for key, value in vars(self).items()][:-2]
+        # print all fields of the node apart from the ones of the base class
+        vars_list = [f"{name}={getattr(self, name)}" for name in self._field_names()]
         vars_str = ", ".join(vars_list)
         return f"{self.tkw_op_name}({vars_str})"
 
     def add_to_graph(self, region_graph: RegionGraph) -> fx.Node:
-        arg_list = tuple([value for _, value in vars(self).items()])
+        arg_list = tuple(getattr(self, name) for name in self._field_names())
         self.graph = region_graph
         self.fx_node = region_graph.create_node(
             "call_function",
@@ -164,7 +186,7 @@ class CustomOp(ABC):
         return self.fx_node
 
     def _add_proxy_to_graph(self, region_graph: RegionGraph):
-        arg_list = tuple([value for _, value in vars(self).items()])
+        arg_list = tuple(getattr(self, name) for name in self._field_names())
         self.graph = region_graph
         self.fx_node = region_graph.create_proxy(
             "call_function",
@@ -178,12 +200,11 @@ class CustomOp(ABC):
         Update the value of an argument in the node while keeping the
         underlying fx.Node consistent.
         """
-        inherited_field_count = len(CustomOp.__dataclass_fields__)
-        field_names = [field.name for field in fields(self)[inherited_field_count:]]
+        field_names = self._field_names()
         if isinstance(idx_or_name, str):
-            if idx_or_name not in field_names:
+            idx = type(self)._tkw_field_name_to_idx.get(idx_or_name)
+            if idx is None:
                 raise ValueError(f"Field {idx_or_name} not found")
-            idx = field_names.index(idx_or_name)
         else:
             idx = idx_or_name
         if isinstance(value, CustomOp):
@@ -206,7 +227,8 @@ class CustomOp(ABC):
             graph = self.graph
             graph.inserting_after(self.fx_node)
         new_node = graph.node_copy(self.fx_node)
-        new_node.tkw_op = self
+        new_node.tkw_op = type(self)
+        new_node.tkw_op_name = self.tkw_op_name
         if new_name:
             new_node.name = new_name
         return get_custom(new_node)
@@ -273,8 +295,8 @@ class Unknown(CustomOp):
         return instance
 
     def custom_string(self, value_map: dict[str, str]) -> str:
-        # print all variables of the node apart from graph and op
-        vars_list = [f"{key}={value}" for key, value in vars(self).items()][:-2]
+        # print all fields of the node apart from the ones of the base class
+        vars_list = [f"{name}={getattr(self, name)}" for name in self._field_names()]
         vars_str = ", ".join(vars_list)
         return f"unknown: {self.fx_node.name}({vars_str})"
 
@@ -332,8 +354,8 @@ class Placeholder(CustomOp):
         return self.fx_node
 
     def custom_string(self, value_map: dict[str, str]) -> str:
-        # print all variables of the node apart from graph and op
-        vars_list = [f"{key}={value}" for key, value in vars(self).items()][:-2]
+        # print all fields of the node apart from the ones of the base class
+        vars_list = [f"{name}={getattr(self, name)}" for name in self._field_names()]
         vars_str = ", ".join(vars_list)
         return f"{self.tkw_op_name}({vars_str})"
 
@@ -394,12 +416,13 @@ class MMA(CustomOp):
 
     @property
     def indexing_dims(self) -> list[IndexSymbol]:
-        combined_dims = (
-            get_custom(self.lhs).indexing_dims
-            + get_custom(self.rhs).indexing_dims
-            + get_custom(self.acc).indexing_dims
-        )
-        unique_dims = list(dict.fromkeys(combined_dims))
+        unique_dims: list[IndexSymbol] = []
+        seen: set[IndexSymbol] = set()
+        for operand in (self.lhs, self.rhs, self.acc):
+            for dim in get_custom(operand).indexing_dims:
+                if dim not in seen:
+                    seen.add(dim)
+                    unique_dims.append(dim)
         return unique_dims
 
 
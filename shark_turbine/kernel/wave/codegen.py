@@ -35,9 +35,8 @@ class WaveEmitter:
 
     def _emit_function_call_node(self, node: fx.Node):
         target_op = node.tkw_op_name
-        try:
-            handler = self.OP_HANDLERS[target_op]
-        except KeyError:
+        handler = self.OP_HANDLERS.get(target_op)
+        if handler is None:
             raise CodegenError(f"No handler registered for op {target_op}")
 
         handler(self, node)
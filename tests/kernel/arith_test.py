@@ -49,6 +49,22 @@ class Test(unittest.TestCase):
         with tk.gen.TestLaunchContext():
             iota_kernel(torch.zeros(17))
 
+    def testIndexIdentityFolding(self):
+        @tk.gen.thread(M)
+        def fold_kernel(out: tkl.OutputBuffer[M, tkl.index]):
+            i = tkl.program_id(0)
+            out[i] = (i * 1 + 0) * 0 + i * 3
+
+        with tk.gen.TestLaunchContext():
+            mb, *_ = fold_kernel._trace_and_get_kernel_signature(
+                (torch.zeros(17, dtype=torch.int64),), {}
+            )
+        asm = mb.module_op.get_asm()
+        # Only `i * 3` should survive: adding 0, multiplying by 1 and
+        # multiplying by 0 fold away without emitting ops.
+        self.assertEqual(asm.count("arith.muli"), 1)
+        self.assertNotIn("arith.addi", asm)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
@@ -161,6 +161,13 @@ class ContextTest(unittest.TestCase):
         self.assertEqual(c.dyn_dims[0], c.eval_dim(inst, kb1, 0))
         self.assertEqual(c.dyn_dims[0] * 4, c.eval_dim(inst, kb1, 1))
 
+    def testSimplifyExprAfterFinalize(self):
+        c = IndexingContext()
+        c.bind_constant(M, 4)
+        self.assertEqual(M * 2, c.simplify_expr(M * 2))
+        c.finalize()
+        self.assertEqual(8, c.simplify_expr(M * 2))
+
 
 class SymIndexTest(unittest.TestCase):
     def testUnbacked(self):
@@ -4,6 +4,7 @@ import unittest
 import torch
 import shark_turbine.kernel as tk
 import shark_turbine.kernel.lang as tkl
+from shark_turbine.kernel.compiler.base import CodegenError
 
 M = tk.lang.sym.M
 K = tk.lang.sym.K
@@ -62,6 +63,118 @@ class Test(unittest.TestCase):
             output = torch.zeros(128, 64, dtype=torch.float32)
             for_loop_kernel(input, output)
 
+    def testSingleIterationForLoopFx(self):
+        @tk.gen.thread(M)
+        def for_loop_kernel(
+            input: tk.lang.InputBuffer[M, K, tkl.f32],
+            output: tk.lang.OutputBuffer[M, K, tkl.f32],
+        ):
+            row_idx = tkl.program_id(0)
+            sum = input[row_idx, 0]
+            prefetch = input[row_idx, 1]
+
+            @tkl.for_loop(2, 3, init_args=[sum, prefetch])
+            def prefetch_sum(i, sum, prefetch):
+                new_sum = sum + prefetch
+                new_prefetch = input[row_idx, i]
+                return new_sum, new_prefetch
+
+            output[row_idx, 0] = prefetch_sum[0]
+
+        with tk.gen.TestLaunchContext():
+            input = torch.randn(128, 64, dtype=torch.float32)
+            output = torch.zeros(128, 64, dtype=torch.float32)
+            mb, *_ = for_loop_kernel._trace_and_get_kernel_signature(
+                (input, output), {}
+            )
+        asm = mb.module_op.get_asm()
+        # The single iteration is emitted inline, with the induction variable
+        # replaced by the start value.
+        self.assertNotIn("scf.for", asm)
+        self.assertIn("%c2 = arith.constant 2 : index", asm)
+        self.assertRegex(asm, r"vector.transfer_read %\w+\[%workgroup_id_0, %c2\]")
+
+    def testReadAfterForLoopFx(self):
+        @tk.gen.thread(M)
+        def for_loop_kernel(
+            input: tk.lang.InputBuffer[M, K, tkl.f32],
+            output: tk.lang.OutputBuffer[M, K, tkl.f32],
+        ):
+            row_idx = tkl.program_id(0)
+            sum = tkl.constant((1, 1), tkl.f32, 0.0)
+
+            # The first use of `input` is inside the loop body.
+            @tkl.for_loop(2, 5, init_args=[sum])
+            def loop_sum(i, sum):
+                return (sum + input[row_idx, i],)
+
+            output[row_idx, 0] = loop_sum[0] + input[row_idx, 0]
+
+        with tk.gen.TestLaunchContext():
+            input = torch.randn(128, 64, dtype=torch.float32)
+            output = torch.zeros(128, 64, dtype=torch.float32)
+            # Verifies the module, which fails if the binding of `input` were
+            # only created in the loop body.
+            for_loop_kernel._trace_and_get_kernel_signature((input, output), {})
+
+    def testTooManyIndices(self):
+        @tk.gen.thread(M)
+        def copy_kernel(
+            input: tk.lang.InputBuffer[M, K, tkl.f32],
+            output: tk.lang.OutputBuffer[M, K, tkl.f32],
+        ):
+            row_idx = tkl.program_id(0)
+            output[row_idx, 0] = input[row_idx, 0, 1]
+
+        with tk.gen.TestLaunchContext():
+            input = torch.randn(128, 64, dtype=torch.float32)
+            output = torch.zeros(128, 64, dtype=torch.float32)
+            with self.assertRaisesRegex(CodegenError, "Too many indices"):
+                copy_kernel._trace_and_get_kernel_signature((input, output), {})
+
+    def testConstantReuse(self):
+        @tk.gen.thread(M)
+        def copy_kernel(
+            input: tk.lang.InputBuffer[M, K, tkl.f32],
+            output: tk.lang.OutputBuffer[M, K, tkl.f32],
+        ):
+            row_idx = tkl.program_id(0)
+            output[row_idx, 7] = input[row_idx, 7]
+
+        with tk.gen.TestLaunchContext():
+            input = torch.randn(128, 64, dtype=torch.float32)
+            output = torch.zeros(128, 64, dtype=torch.float32)
+            mb, *_ = copy_kernel._trace_and_get_kernel_signature((input, output), {})
+        asm = mb.module_op.get_asm()
+        # Both accesses share a single materialized index.
+        self.assertEqual(asm.count("arith.constant 7 : index"), 1)
+
+    def testConstantNotReusedOutsideLoop(self):
+        @tk.gen.thread(M)
+        def for_loop_kernel(
+            input: tk.lang.InputBuffer[M, K, tkl.f32],
+            output: tk.lang.OutputBuffer[M, K, tkl.f32],
+        ):
+            row_idx = tkl.program_id(0)
+            sum = input[row_idx, 0]
+
+            @tkl.for_loop(2, 5, init_args=[sum])
+            def loop_sum(i, sum):
+                return (sum + input[row_idx, 7],)
+
+            output[row_idx, 7] = loop_sum[0]
+
+        with tk.gen.TestLaunchContext():
+            input = torch.randn(128, 64, dtype=torch.float32)
+            output = torch.zeros(128, 64, dtype=torch.float32)
+            # Verifies the module, which fails if the constant created in the
+            # loop body were used after the loop.
+            mb, *_ = for_loop_kernel._trace_and_get_kernel_signature(
+                (input, output), {}
+            )
+        asm = mb.module_op.get_asm()
+        self.assertEqual(asm.count("arith.constant 7 : index"), 2)
+
     def testGemmFx(self):
         N = tkl.sym.N
         M = tkl.sym.M
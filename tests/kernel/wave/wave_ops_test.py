@@ -0,0 +1,48 @@
+import logging
+import unittest
+
+import shark_turbine.kernel.lang as tkl
+import shark_turbine.kernel.wave as tkw
+from shark_turbine.kernel.ops.wave_ops import get_custom, Read
+
+M = tkl.sym.M
+N = tkl.sym.N
+K = tkl.sym.K
+ADDRESS_SPACE = tkl.sym.ADDRESS_SPACE
+
+
+class WaveOpsTest(unittest.TestCase):
+    def testUpdateArgIndexingDims(self):
+        @tkw.wave_trace_only()
+        def test(
+            a: tkl.Memory[M, N, ADDRESS_SPACE, tkl.f16],
+            b: tkl.Memory[M, K, ADDRESS_SPACE, tkl.f16],
+        ):
+            tkw.read(a)
+
+        trace = test()
+        nodes = {node.name: node for node in trace.get_root_graph().nodes}
+        read = get_custom(nodes["read"])
+        self.assertIsInstance(read, Read)
+        self.assertEqual(read.indexing_dims, [M, N])
+
+        read.update_arg("memory", nodes["b"])
+        self.assertEqual(read.indexing_dims, [M, K])
+        self.assertEqual(get_custom(read.fx_node).indexing_dims, [M, K])
+
+    def testCopy(self):
+        @tkw.wave_trace_only()
+        def test(a: tkl.Memory[M, N, ADDRESS_SPACE, tkl.f16]):
+            tkw.read(a)
+
+        trace = test()
+        nodes = {node.name: node for node in trace.get_root_graph().nodes}
+        copy = get_custom(nodes["read"]).copy()
+        self.assertIsNot(copy.fx_node, nodes["read"])
+        self.assertIs(type(get_custom(copy.fx_node)), Read)
+        self.assertEqual(copy.fx_node.tkw_op_name, nodes["read"].tkw_op_name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    unittest.main()